@@ -1,29 +1,96 @@
 """Flask web application for warehouse management."""
-from flask import Flask, render_template, request, redirect, url_for, flash
+import csv
+import io
+import itertools
+import math
+import re
+from flask import (
+    Flask, render_template, request, redirect, url_for, flash, jsonify
+)
 from warehouse import Warehouse
 
 app = Flask(__name__)
 app.secret_key = 'warehouse-app-secret-key'
 
+# Compile templates up front so the first request does not pay for it.
+# Flask keeps them cached and only reloads on change in debug mode.
+for template_name in app.jinja_loader.list_templates():
+    app.jinja_env.get_template(template_name)
+
 # In-memory storage for warehouses
 warehouses = {}
-next_warehouse_id = 1
+# next() on a count is atomic, so concurrent creates never share an id
+warehouse_ids = itertools.count(1)
+
+# Finite decimal numbers as browsers submit them, e.g. "5", "-2", ".5", "1e3".
+# Whitespace is spelled out because \s also matches control characters
+# such as "\x1f" that float() rejects.
+is_number = re.compile(
+    r'[ \t\n\r\f\v]*[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?'
+    r'[ \t\n\r\f\v]*'
+).fullmatch
 
 
 def get_warehouse_or_redirect(warehouse_id):
     """Return warehouse if exists, else flash error and return None."""
-    if warehouse_id in warehouses:
-        return warehouses[warehouse_id]
-    flash('Warehouse not found', 'error')
-    return None
+    warehouse = warehouses.get(warehouse_id)
+    if warehouse is None:
+        flash('Warehouse not found', 'error')
+    return warehouse
 
 
 def parse_float(value, default=0):
-    """Parse float from string, return default on error."""
-    try:
-        return float(value) if value else default
-    except ValueError:
+    """Parse float from string. Returns default if empty, None if invalid."""
+    if not value:
+        return default
+    if not is_number(value):
         return None
+    number = float(value)
+    # Huge exponents such as "1e400" overflow to inf
+    return number if math.isfinite(number) else None
+
+
+def form_text(field):
+    """Return a stripped text field from the submitted form."""
+    return request.form.get(field, '').strip()
+
+
+def form_number(field):
+    """Return a numeric form field: 0 if empty, None if invalid."""
+    return parse_float(form_text(field))
+
+
+def read_csv_rows(text):
+    """Return non-empty CSV rows from text and an error message or None."""
+    reader = csv.reader(io.StringIO(text), skipinitialspace=True)
+    try:
+        return [row for row in reader if row], None
+    except csv.Error as error:
+        return None, f'Invalid line: {error}'
+
+
+def parse_item_lines(text):
+    """Parse "name, quantity" lines. Returns (pairs, error message or None)."""
+    rows, error = read_csv_rows(text)
+    if error:
+        return None, error
+    pairs = []
+    for row in rows:
+        item_name = row[0].strip()
+        quantity = parse_float(row[1], None) if len(row) == 2 else None
+        if not item_name or quantity is None:
+            return None, f'Invalid line: {",".join(row)}'
+        pairs.append((item_name, quantity))
+    if not pairs:
+        return None, 'No items given'
+    return pairs, None
+
+
+def items_added_message(pairs, warehouse_name):
+    """Build the success message for a bulk add of (name, quantity) pairs."""
+    count = len({item_name for item_name, _ in pairs})
+    noun = 'item' if count == 1 else 'items'
+    return f'Added {count} {noun} to {warehouse_name}'
 
 
 def validate_warehouse_form(name, capacity, min_capacity=0):
@@ -39,6 +106,21 @@ def validate_warehouse_form(name, capacity, min_capacity=0):
     return None
 
 
+def update_warehouse(warehouse, name, capacity):
+    """Validate and apply an edit under the warehouse lock.
+
+    Holding the lock keeps a concurrent add from raising saldo above the
+    new capacity between the check and the assignment. Returns error
+    message or None.
+    """
+    with warehouse.lock:
+        error = validate_warehouse_form(name, capacity, warehouse.saldo)
+        if not error:
+            warehouse.name = name
+            warehouse.tilavuus = capacity
+    return error
+
+
 @app.route('/')
 def index():
     """Overview page showing all warehouses."""
@@ -60,22 +142,36 @@ def warehouse_detail(warehouse_id):
     )
 
 
+@app.route('/api/warehouse/<int:warehouse_id>')
+def warehouse_api(warehouse_id):
+    """Warehouse details as JSON for programmatic clients."""
+    warehouse = warehouses.get(warehouse_id)
+    if warehouse is None:
+        return jsonify(error='Warehouse not found'), 404
+    with warehouse.lock:
+        payload = {
+            'name': warehouse.name,
+            'tilavuus': warehouse.tilavuus,
+            'saldo': warehouse.saldo,
+            'items': dict(warehouse.items)
+        }
+    return jsonify(payload)
+
+
 @app.route('/warehouse/new', methods=['GET', 'POST'])
 def create_warehouse():
     """Create a new warehouse."""
-    global next_warehouse_id  # pylint: disable=global-statement
     if request.method != 'POST':
         return render_template('create_warehouse.html')
 
-    name = request.form.get('name', '').strip()
-    capacity = parse_float(request.form.get('capacity', 0))
+    name = form_text('name')
+    capacity = form_number('capacity')
     error = validate_warehouse_form(name, capacity)
     if error:
         flash(error, 'error')
         return render_template('create_warehouse.html')
 
-    warehouses[next_warehouse_id] = Warehouse(name, capacity)
-    next_warehouse_id += 1
+    warehouses[next(warehouse_ids)] = Warehouse(name, capacity)
     flash(f'Warehouse "{name}" created successfully', 'success')
     return redirect(url_for('index'))
 
@@ -91,15 +187,13 @@ def edit_warehouse(warehouse_id):
     if request.method != 'POST':
         return render_template('edit_warehouse.html', **ctx)
 
-    name = request.form.get('name', '').strip()
-    capacity = parse_float(request.form.get('capacity', 0))
-    error = validate_warehouse_form(name, capacity, warehouse.saldo)
+    name = form_text('name')
+    capacity = form_number('capacity')
+    error = update_warehouse(warehouse, name, capacity)
     if error:
         flash(error, 'error')
         return render_template('edit_warehouse.html', **ctx)
 
-    warehouse.name = name
-    warehouse.tilavuus = capacity
     flash(f'Warehouse "{name}" updated successfully', 'success')
     return redirect(url_for('warehouse_detail', warehouse_id=warehouse_id))
 
@@ -115,12 +209,13 @@ def add_item():
         warehouse_id = int(request.form.get('warehouse_id', 0))
     except ValueError:
         warehouse_id = None
-    if warehouse_id is None or warehouse_id not in warehouses:
+    warehouse = warehouses.get(warehouse_id)
+    if warehouse is None:
         flash('Warehouse not found', 'error')
         return render_template('add_item.html', **ctx)
 
-    item_name = request.form.get('item_name', '').strip()
-    quantity = parse_float(request.form.get('quantity', 0))
+    item_name = form_text('item_name')
+    quantity = form_number('quantity')
 
     if not item_name:
         flash('Item name is required', 'error')
@@ -129,7 +224,6 @@ def add_item():
         flash('Quantity must be a number', 'error')
         return render_template('add_item.html', **ctx)
 
-    warehouse = warehouses[warehouse_id]
     success, error = warehouse.add_item(item_name, quantity)
     if not success:
         flash(error, 'error')
@@ -139,6 +233,23 @@ def add_item():
     return redirect(url_for('warehouse_detail', warehouse_id=warehouse_id))
 
 
+@app.route('/warehouse/<int:warehouse_id>/bulk-add', methods=['POST'])
+def bulk_add_items(warehouse_id):
+    """Add several items to a warehouse from "name, quantity" lines."""
+    warehouse = get_warehouse_or_redirect(warehouse_id)
+    if not warehouse:
+        return redirect(url_for('index'))
+
+    pairs, error = parse_item_lines(request.form.get('items', ''))
+    if not error:
+        _, error = warehouse.add_items(pairs)
+    if error:
+        flash(error, 'error')
+    else:
+        flash(items_added_message(pairs, warehouse.name), 'success')
+    return redirect(url_for('warehouse_detail', warehouse_id=warehouse_id))
+
+
 @app.route(
     '/warehouse/<int:warehouse_id>/remove-item/<item_name>',
     methods=['POST']
@@ -149,7 +260,7 @@ def remove_item(warehouse_id, item_name):
     if not warehouse:
         return redirect(url_for('index'))
 
-    quantity_str = request.form.get('quantity', '').strip()
+    quantity_str = form_text('quantity')
     quantity = parse_float(quantity_str) if quantity_str else None
     if quantity_str and quantity is None:
         flash('Quantity must be a number', 'error')
@@ -174,45 +285,45 @@ def update_items(warehouse_id):
     changes_made = False
 
     # Process each item's new quantity
-    for item_name in list(warehouse.items.keys()):
-        field_name = f'qty_{item_name}'
-        new_qty_str = request.form.get(field_name, '').strip()
-        if not new_qty_str:
-            continue
-
-        new_qty = parse_float(new_qty_str)
-        if new_qty is None:
-            errors.append(f'Invalid quantity for {item_name}')
-            continue
-
-        current_qty = warehouse.items[item_name]
-        if new_qty == current_qty:
-            continue
-
-        if new_qty < 0:
-            errors.append(f'Quantity for {item_name} cannot be negative')
-            continue
-
-        if new_qty == 0:
-            # Remove item completely
-            warehouse.ota_varastosta(current_qty)
-            del warehouse.items[item_name]
-            changes_made = True
-        elif new_qty < current_qty:
-            # Decrease quantity
-            diff = current_qty - new_qty
-            warehouse.ota_varastosta(diff)
-            warehouse.items[item_name] = new_qty
-            changes_made = True
-        else:
-            # Increase quantity
-            diff = new_qty - current_qty
-            if diff > warehouse.paljonko_mahtuu():
-                errors.append(f'Not enough space for {item_name}')
+    with warehouse.lock:
+        for item_name in list(warehouse.items.keys()):
+            new_qty_str = form_text(f'qty_{item_name}')
+            if not new_qty_str:
                 continue
-            warehouse.lisaa_varastoon(diff)
-            warehouse.items[item_name] = new_qty
-            changes_made = True
+
+            new_qty = parse_float(new_qty_str)
+            if new_qty is None:
+                errors.append(f'Invalid quantity for {item_name}')
+                continue
+
+            current_qty = warehouse.items[item_name]
+            if new_qty == current_qty:
+                continue
+
+            if new_qty < 0:
+                errors.append(f'Quantity for {item_name} cannot be negative')
+                continue
+
+            if new_qty == 0:
+                # Remove item completely
+                warehouse.ota_varastosta(current_qty)
+                del warehouse.items[item_name]
+                changes_made = True
+            elif new_qty < current_qty:
+                # Decrease quantity
+                diff = current_qty - new_qty
+                warehouse.ota_varastosta(diff)
+                warehouse.items[item_name] = new_qty
+                changes_made = True
+            else:
+                # Increase quantity
+                diff = new_qty - current_qty
+                if diff > warehouse.paljonko_mahtuu():
+                    errors.append(f'Not enough space for {item_name}')
+                    continue
+                warehouse.lisaa_varastoon(diff)
+                warehouse.items[item_name] = new_qty
+                changes_made = True
 
     if errors:
         for error in errors:
@@ -228,13 +339,13 @@ def update_items(warehouse_id):
 @app.route('/warehouse/<int:warehouse_id>/delete', methods=['POST'])
 def delete_warehouse(warehouse_id):
     """Delete a warehouse."""
-    warehouse = get_warehouse_or_redirect(warehouse_id)
-    if not warehouse:
+    # pop() is a single step, so two concurrent deletes cannot both succeed
+    warehouse = warehouses.pop(warehouse_id, None)
+    if warehouse is None:
+        flash('Warehouse not found', 'error')
         return redirect(url_for('index'))
 
-    name = warehouse.name
-    del warehouses[warehouse_id]
-    flash(f'Warehouse "{name}" deleted successfully', 'success')
+    flash(f'Warehouse "{warehouse.name}" deleted successfully', 'success')
     return redirect(url_for('index'))
 
 
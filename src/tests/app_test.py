@@ -0,0 +1,225 @@
+import threading
+import unittest
+from app import app, warehouses, parse_float, parse_item_lines
+from warehouse import Warehouse
+
+
+class TestParseItemLines(unittest.TestCase):
+    def test_rivit_luetaan_pareiksi(self):
+        pairs, error = parse_item_lines("a, 2\nb,3.5")
+
+        self.assertIsNone(error)
+        self.assertEqual(pairs, [("a", 2.0), ("b", 3.5)])
+
+    def test_lainausmerkeissa_pilkku_nimessa(self):
+        pairs, error = parse_item_lines('"c,d", 1')
+
+        self.assertIsNone(error)
+        self.assertEqual(pairs, [("c,d", 1.0)])
+
+    def test_lainausmerkeissa_rivinvaihto_nimessa(self):
+        pairs, error = parse_item_lines('"a\nb", 1')
+
+        self.assertIsNone(error)
+        self.assertEqual(pairs, [("a\nb", 1.0)])
+
+    def test_puuttuva_maara_on_virhe(self):
+        pairs, error = parse_item_lines("a,")
+
+        self.assertIsNone(pairs)
+        self.assertEqual(error, "Invalid line: a,")
+
+    def test_liian_pitka_kentta_on_virhe(self):
+        pairs, error = parse_item_lines("x" * 200000 + ",1")
+
+        self.assertIsNone(pairs)
+        self.assertTrue(error.startswith("Invalid line"))
+
+    def test_tyhjat_rivit_ohitetaan(self):
+        pairs, error = parse_item_lines("\na,1\n\nb,2\n")
+
+        self.assertIsNone(error)
+        self.assertEqual(pairs, [("a", 1.0), ("b", 2.0)])
+
+    def test_puuttuva_kentta_on_virhe(self):
+        pairs, error = parse_item_lines("a,1\nb")
+
+        self.assertIsNone(pairs)
+        self.assertEqual(error, "Invalid line: b")
+
+    def test_ylimaarainen_kentta_on_virhe(self):
+        pairs, error = parse_item_lines("a,1,2")
+
+        self.assertIsNone(pairs)
+        self.assertEqual(error, "Invalid line: a,1,2")
+
+    def test_tyhja_syote_on_virhe(self):
+        for text in ("", "\n\n"):
+            pairs, error = parse_item_lines(text)
+
+            self.assertIsNone(pairs)
+            self.assertEqual(error, "No items given")
+
+
+class TestParseFloat(unittest.TestCase):
+    def test_hyvaksytyt_muodot(self):
+        cases = {
+            "5": 5.0, " 5 ": 5.0, ".5": 0.5, "5.": 5.0, "-2": -2.0,
+            "+1.5": 1.5, "1e3": 1000.0, "2.5E-1": 0.25,
+        }
+        for value, expected in cases.items():
+            self.assertEqual(parse_float(value), expected, value)
+
+    def test_hylatyt_muodot(self):
+        for value in ("nan", "inf", "1e400", "1_0", "abc", "1.2.3", "e3",
+                      "1\x1f", "\x1f1"):
+            self.assertIsNone(parse_float(value), value)
+
+    def test_tyhja_palauttaa_oletuksen(self):
+        self.assertEqual(parse_float(""), 0)
+        self.assertEqual(parse_float(None, 7), 7)
+
+
+class TestBulkAdd(unittest.TestCase):
+    def setUp(self):
+        warehouses.clear()
+        self.warehouse = Warehouse("Varasto", 10)
+        warehouses[1] = self.warehouse
+        self.client = app.test_client()
+
+    def bulk_add(self, text):
+        return self.client.post("/warehouse/1/bulk-add", data={"items": text})
+
+    def flashes(self):
+        with self.client.session_transaction() as session:
+            return session.get("_flashes", [])
+
+    def test_rivit_lisataan_varastoon(self):
+        response = self.bulk_add("a, 2\nb,3\na,1")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.warehouse.items, {"a": 3, "b": 3})
+        self.assertAlmostEqual(self.warehouse.saldo, 6)
+        self.assertEqual(
+            self.flashes(), [("success", "Added 2 items to Varasto")]
+        )
+
+    def test_yli_tilavuuden_ei_lisaa_mitaan(self):
+        response = self.bulk_add("a,5\nb,6")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.warehouse.items, {})
+        self.assertAlmostEqual(self.warehouse.saldo, 0)
+        self.assertEqual(
+            self.flashes(), [("error", "Not enough space in warehouse")]
+        )
+
+    def test_virheellinen_rivi_ei_lisaa_mitaan(self):
+        for text in ("a,1\nb", "a,1\x1f", "a,", "x" * 200000 + ",1"):
+            response = self.bulk_add(text)
+
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(self.warehouse.items, {})
+            self.assertTrue(self.flashes()[-1][1].startswith("Invalid line"))
+
+    def test_tuntematon_varasto(self):
+        response = self.client.post(
+            "/warehouse/2/bulk-add", data={"items": "a,1"}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.flashes(), [("error", "Warehouse not found")])
+
+
+class TestWarehouseApi(unittest.TestCase):
+    def setUp(self):
+        warehouses.clear()
+        warehouses[1] = Warehouse("Varasto", 10)
+        warehouses[1].add_item("a", 2.5)
+        self.client = app.test_client()
+
+    def test_varasto_jsonina(self):
+        response = self.client.get("/api/warehouse/1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {
+            "name": "Varasto",
+            "tilavuus": 10,
+            "saldo": 2.5,
+            "items": {"a": 2.5},
+        })
+
+    def test_tuntematon_varasto_404(self):
+        response = self.client.get("/api/warehouse/2")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json, {"error": "Warehouse not found"})
+
+
+class TestWarehouseRoutes(unittest.TestCase):
+    def setUp(self):
+        warehouses.clear()
+        self.client = app.test_client()
+
+    def flashes(self):
+        with self.client.session_transaction() as session:
+            return session.get("_flashes", [])
+
+    def create(self, name, capacity="10", client=None):
+        return (client or self.client).post(
+            "/warehouse/new", data={"name": name, "capacity": capacity}
+        )
+
+    def test_luodut_varastot_saavat_eri_tunnisteet(self):
+        self.create("A")
+        self.create("B")
+
+        self.assertEqual(len(warehouses), 2)
+        self.assertEqual(
+            sorted(w.name for w in warehouses.values()), ["A", "B"]
+        )
+
+    def test_rinnakkaiset_luonnit_saavat_eri_tunnisteet(self):
+        threads = [
+            threading.Thread(
+                target=self.create, args=(f"W{i}",),
+                kwargs={"client": app.test_client()}
+            )
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(warehouses), 20)
+
+    def test_kahdesti_poisto_ei_kaada(self):
+        self.create("A")
+        warehouse_id = next(iter(warehouses))
+        url = f"/warehouse/{warehouse_id}/delete"
+
+        first = self.client.post(url)
+        second = self.client.post(url)
+
+        self.assertEqual(first.status_code, 302)
+        self.assertEqual(second.status_code, 302)
+        self.assertEqual(warehouses, {})
+        self.assertEqual(self.flashes()[-1], ("error", "Warehouse not found"))
+
+    def test_muokkaus_alle_saldon_hylataan(self):
+        self.create("A")
+        warehouse_id, warehouse = next(iter(warehouses.items()))
+        warehouse.add_item("a", 6)
+
+        response = self.client.post(
+            f"/warehouse/{warehouse_id}/edit",
+            data={"name": "B", "capacity": "5"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(warehouse.name, "A")
+        self.assertAlmostEqual(warehouse.tilavuus, 10)
+        self.assertIn(
+            b"Cannot reduce capacity below current stock", response.data
+        )
@@ -0,0 +1,61 @@
+import threading
+import unittest
+from warehouse import Warehouse
+
+
+class TestWarehouse(unittest.TestCase):
+    def setUp(self):
+        self.warehouse = Warehouse("Varasto", 10)
+
+    def test_add_items_lisaa_kaikki(self):
+        success, error = self.warehouse.add_items([("a", 2), ("b", 3)])
+
+        self.assertTrue(success)
+        self.assertIsNone(error)
+        self.assertAlmostEqual(self.warehouse.saldo, 5)
+        self.assertEqual(self.warehouse.items, {"a": 2, "b": 3})
+
+    def test_add_items_samat_nimet_summautuvat(self):
+        self.warehouse.add_items([("a", 2), ("b", 3), ("a", 1)])
+
+        self.assertEqual(self.warehouse.items, {"a": 3, "b": 3})
+
+    def test_add_items_ei_positiivinen_ei_muuta_mitaan(self):
+        self.warehouse.add_item("a", 1)
+
+        success, error = self.warehouse.add_items([("a", 2), ("b", 0)])
+
+        self.assertFalse(success)
+        self.assertEqual(error, "Quantity must be positive")
+        self.assertAlmostEqual(self.warehouse.saldo, 1)
+        self.assertEqual(self.warehouse.items, {"a": 1})
+
+    def test_add_items_yli_tilavuuden_ei_muuta_mitaan(self):
+        self.warehouse.add_item("a", 1)
+
+        success, error = self.warehouse.add_items([("a", 5), ("b", 5)])
+
+        self.assertFalse(success)
+        self.assertEqual(error, "Not enough space in warehouse")
+        self.assertAlmostEqual(self.warehouse.saldo, 1)
+        self.assertEqual(self.warehouse.items, {"a": 1})
+
+    def test_add_item_kayttaa_samaa_tarkistusta(self):
+        success, error = self.warehouse.add_item("a", 11)
+
+        self.assertFalse(success)
+        self.assertEqual(error, "Not enough space in warehouse")
+        self.assertEqual(self.warehouse.items, {})
+
+    def test_rinnakkaiset_lisaykset_eivat_ylita_tilavuutta(self):
+        threads = [
+            threading.Thread(target=self.warehouse.add_item, args=("a", 1))
+            for _ in range(50)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertAlmostEqual(self.warehouse.saldo, 10)
+        self.assertEqual(self.warehouse.items, {"a": 10})
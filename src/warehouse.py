@@ -1,4 +1,6 @@
 """Warehouse model extending Varasto with name and item management."""
+import sys
+import threading
 from varasto import Varasto
 
 
@@ -9,6 +11,8 @@ class Warehouse(Varasto):
         super().__init__(tilavuus, alku_saldo)
         self.name = name
         self.items = {}  # item_name -> quantity
+        # Guards items and saldo against concurrent requests
+        self.lock = threading.Lock()
 
     def add_item(self, item_name, quantity):
         """Add an item to the warehouse.
@@ -16,16 +20,30 @@ class Warehouse(Varasto):
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        if quantity <= 0:
+        return self.add_items([(item_name, quantity)])
+
+    def add_items(self, pairs):
+        """Add several items at once, either all of them or none.
+
+        Args:
+            pairs: List of (item_name, quantity) tuples
+
+        Returns:
+            tuple: (success: bool, error_message: str or None)
+        """
+        if any(quantity <= 0 for _, quantity in pairs):
             return False, "Quantity must be positive"
-        if quantity > self.paljonko_mahtuu():
-            return False, "Not enough space in warehouse"
-
-        self.lisaa_varastoon(quantity)
-        if item_name in self.items:
-            self.items[item_name] += quantity
-        else:
-            self.items[item_name] = quantity
+        total = sum(quantity for _, quantity in pairs)
+        with self.lock:
+            saldo = self.saldo
+            if total > self.tilavuus - saldo:
+                return False, "Not enough space in warehouse"
+
+            self.saldo = saldo + total
+            for item_name, quantity in pairs:
+                # Warehouses often share item names; keep one string per name
+                item_name = sys.intern(item_name)
+                self.items[item_name] = self.items.get(item_name, 0) + quantity
         return True, None
 
     def remove_item(self, item_name, quantity=None):
@@ -38,22 +56,29 @@ class Warehouse(Varasto):
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        if item_name not in self.items:
-            return False, "Item not found"
+        with self.lock:
+            current = self.items.get(item_name)
+            quantity = current if quantity is None else quantity
+            if error := self._removal_error(current, quantity):
+                return False, error
 
-        if quantity is None:
-            quantity = self.items[item_name]
+            self.ota_varastosta(quantity)
+            if quantity == current:
+                del self.items[item_name]
+            else:
+                self.items[item_name] = current - quantity
+            return True, None
 
+    @staticmethod
+    def _removal_error(current, quantity):
+        """Validate removing quantity from an item with current amount."""
+        if current is None:
+            return "Item not found"
         if quantity <= 0:
-            return False, "Quantity must be positive"
-        if quantity > self.items[item_name]:
-            return False, "Not enough items to remove"
-
-        self.ota_varastosta(quantity)
-        self.items[item_name] -= quantity
-        if self.items[item_name] == 0:
-            del self.items[item_name]
-        return True, None
+            return "Quantity must be positive"
+        if quantity > current:
+            return "Not enough items to remove"
+        return None
 
     def get_item_count(self):
         """Get total number of unique items."""